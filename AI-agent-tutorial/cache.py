@@ -0,0 +1,60 @@
+import os
+import sqlite3
+import threading
+import time
+
+CACHE_PATH = os.getenv("TOOL_CACHE_PATH", ".tool_cache.sqlite3")
+CACHE_TTL = float(os.getenv("TOOL_CACHE_TTL", str(24 * 3600)))  # seconds
+CACHE_MAX_BYTES = int(os.getenv("TOOL_CACHE_MAX_BYTES", str(50 * 1024 * 1024)))
+
+
+class DiskCache:
+    """Small on-disk key/value store with per-entry TTL and LRU eviction by total size."""
+
+    def __init__(self, path=CACHE_PATH, ttl=CACHE_TTL, max_bytes=CACHE_MAX_BYTES):
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()  # tools may run in several threads at once
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS cache ("
+            "key TEXT PRIMARY KEY, value TEXT, size INTEGER, expires_at REAL, last_used REAL)"
+        )
+        self.db.commit()
+
+    def get(self, key):
+        now = time.time()
+        with self.lock:
+            row = self.db.execute("SELECT value, expires_at FROM cache WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            if row[1] < now:
+                self.db.execute("DELETE FROM cache WHERE key = ?", (key,))
+                self.db.commit()
+                return None
+            self.db.execute("UPDATE cache SET last_used = ? WHERE key = ?", (now, key))
+            self.db.commit()
+            return row[0]
+
+    def set(self, key, value, ttl=None):
+        now = time.time()
+        size = len(value.encode("utf-8"))
+        with self.lock:
+            self.db.execute(
+                "INSERT OR REPLACE INTO cache VALUES (?, ?, ?, ?, ?)",
+                (key, value, size, now + (ttl or self.ttl), now),
+            )
+            self.db.execute("DELETE FROM cache WHERE expires_at < ?", (now,))
+            self._evict()
+            self.db.commit()
+
+    def _evict(self):
+        total = self.db.execute("SELECT COALESCE(SUM(size), 0) FROM cache").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        # drop least recently used entries until we're back under the limit
+        for key, size in self.db.execute("SELECT key, size FROM cache ORDER BY last_used").fetchall():
+            self.db.execute("DELETE FROM cache WHERE key = ?", (key,))
+            total -= size
+            if total <= self.max_bytes:
+                break
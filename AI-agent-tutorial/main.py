@@ -1,3 +1,5 @@
+import argparse
+import asyncio
 from dotenv import load_dotenv
 from pydantic import BaseModel
 from langchain_openai import ChatOpenAI
@@ -5,17 +7,28 @@ from langchain_anthropic import ChatAnthropic
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.output_parsers import PydanticOutputParser
 from langchain.agents import create_tool_calling_agent, AgentExecutor
-from tools import search_tool, wiki_tool, save_tool
+from tools import search_tool, wiki_tool, save_tool, writer
+from tracing import TraceRecorder, load_replay
 
 load_dotenv()  # Load environment variables from .env file
 
+arg_parser = argparse.ArgumentParser(description="Research assistant agent")
+arg_parser.add_argument("--trace", help="append per-step latency/token records to this JSONL file")
+arg_parser.add_argument("--replay", help="serve LLM and tool responses from a recorded trace (offline)")
+args = arg_parser.parse_args()
+
 class ReserachResponse(BaseModel):
     topic: str
     summary: str
     sources: list[str]
     tools_used: list[str]
 
-llm = ChatAnthropic(model="claude-3-haiku-20240307")  # Cheapest and fastest
+tools = [search_tool, wiki_tool, save_tool]
+query = None
+if args.replay:
+    query, llm, tools = load_replay(args.replay, tools)
+else:
+    llm = ChatAnthropic(model="claude-3-haiku-20240307")  # Cheapest and fastest
 parser = PydanticOutputParser(pydantic_object=ReserachResponse)
 
 prompt = ChatPromptTemplate.from_messages(
@@ -34,8 +47,6 @@ prompt = ChatPromptTemplate.from_messages(
     ]
 ).partial(format_instructions=parser.get_format_instructions())
 
-tools = [search_tool, wiki_tool, save_tool]
-
 agent = create_tool_calling_agent(
     llm=llm,
     prompt=prompt,
@@ -43,8 +54,19 @@ agent = create_tool_calling_agent(
 )
 
 agent_executor = AgentExecutor(agent=agent, tools=tools, verbose=True)
-query = input("What can I help you research today? ")
-raw_response = agent_executor.invoke({"query": query})
+query = query or input("What can I help you research today? ")
+
+callbacks = []
+if args.trace:
+    tracer = TraceRecorder(args.trace)
+    tracer.write({"type": "run", "query": query, "replay": bool(args.replay)})
+    callbacks.append(tracer)
+
+# async run so tool calls requested in the same step execute concurrently
+raw_response = asyncio.run(agent_executor.ainvoke({"query": query}, config={"callbacks": callbacks}))
+writer.flush()
+if args.trace:
+    tracer.close()
 
 print(raw_response)
 
@@ -2,29 +2,98 @@ from langchain_community.tools import WikipediaQueryRun, DuckDuckGoSearchRun
 from langchain_community.utilities import WikipediaAPIWrapper
 from langchain.tools import Tool
 from datetime import datetime
+import asyncio
+import atexit
+import threading
+from cache import DiskCache
+
+cache = DiskCache()
+
+
+def normalize(text: str) -> str:
+    return " ".join(str(text).lower().split())
+
+
+def cached(name: str, func):
+    """Serve repeated queries for a tool from the on-disk cache."""
+    def run(query: str) -> str:
+        key = f"{name}:{normalize(query)}"
+        hit = cache.get(key)
+        if hit is not None:
+            return hit
+        result = func(query)
+        cache.set(key, result)
+        return result
+    return run
+
+
+def cached_tool(name: str, func, description: str) -> Tool:
+    run = cached(name, func)
+
+    async def arun(query: str) -> str:
+        # lets AgentExecutor.ainvoke run several tool calls from one step concurrently
+        return await asyncio.to_thread(run, query)
+
+    return Tool(name=name, func=run, coroutine=arun, description=description)
+
+
+class BufferedWriter:
+    """Keeps output files open and buffered instead of reopening them on every save."""
+
+    def __init__(self):
+        self.files = {}
+        self.lock = threading.Lock()
+        atexit.register(self.close)
+
+    def write(self, filename: str, text: str):
+        with self.lock:
+            f = self.files.get(filename)
+            if f is None:
+                f = self.files[filename] = open(filename, "a", encoding="utf-8", buffering=64 * 1024)
+            f.write(text)
+
+    def flush(self):
+        with self.lock:
+            for f in self.files.values():
+                f.flush()
+
+    def close(self):
+        with self.lock:
+            for f in self.files.values():
+                f.close()
+            self.files.clear()
+
+
+writer = BufferedWriter()
+
 
 def save_to_txt(data: str, filename: str = "research_output.txt"):
     timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     formatted_text = f"--- Research Output ---\nTimestamp: {timestamp}\n\n{data}\n\n"
-    
-    with open(filename, "a", encoding="utf-8") as f:
-        f.write(formatted_text)
-    
+
+    writer.write(filename, formatted_text)
+
     return f"Data successfully saved to {filename}"
 
+
+async def asave_to_txt(data: str, filename: str = "research_output.txt"):
+    return save_to_txt(data, filename)
+
 # Wrap the function as a tool
 save_tool = Tool(
     name="Save_text_to_file",
     func=save_to_txt,
+    coroutine=asave_to_txt,
     description="Saves the provided text data to a text file. Input should be the text data to save.",
 )
 
 search = DuckDuckGoSearchRun()
-search_tool = Tool(
+search_tool = cached_tool(
     name="SearchWeb",
     func=search.run,
     description="Search the web for information on a topic. Input should be a search query.",
 )
 
 api_wrapper = WikipediaAPIWrapper(top_k_results=1, doc_content_chars_max=100)
-wiki_tool = WikipediaQueryRun(api_wrapper=api_wrapper)
\ No newline at end of file
+wiki = WikipediaQueryRun(api_wrapper=api_wrapper)
+wiki_tool = cached_tool(name=wiki.name, func=wiki.run, description=wiki.description)
@@ -0,0 +1,143 @@
+import json
+import threading
+import time
+from collections import defaultdict
+from typing import Any, List, Optional
+from langchain.tools import Tool
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import BaseMessage, message_to_dict, messages_from_dict
+from langchain_core.outputs import ChatGeneration, ChatResult
+from tools import normalize
+
+
+class TraceRecorder(BaseCallbackHandler):
+    """Callback handler that writes one JSONL record per LLM call and tool call.
+
+    LLM records carry latency and input/output tokens, tool records carry
+    latency and payload sizes; both keep the response so the run can be
+    replayed offline with `load_replay`.
+    """
+
+    def __init__(self, path: str):
+        self.file = open(path, "a", encoding="utf-8")
+        self.lock = threading.Lock()
+        self.started = {}
+
+    def write(self, record: dict):
+        with self.lock:
+            self.file.write(json.dumps(record) + "\n")
+            self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+    def _elapsed_ms(self, run_id):
+        name, start = self.started.pop(run_id)
+        return name, round((time.perf_counter() - start) * 1000, 2)
+
+    def on_chat_model_start(self, serialized, messages, *, run_id, **kwargs):
+        self.started[run_id] = ((serialized or {}).get("name", "llm"), time.perf_counter())
+
+    def on_llm_start(self, serialized, prompts, *, run_id, **kwargs):
+        self.started[run_id] = ((serialized or {}).get("name", "llm"), time.perf_counter())
+
+    def on_llm_end(self, response, *, run_id, **kwargs):
+        name, latency_ms = self._elapsed_ms(run_id)
+        generation = response.generations[0][0]
+        message = getattr(generation, "message", None)
+        usage = (getattr(message, "usage_metadata", None) or {}) if message else {}
+        self.write({
+            "type": "llm",
+            "name": name,
+            "latency_ms": latency_ms,
+            "input_tokens": usage.get("input_tokens"),
+            "output_tokens": usage.get("output_tokens"),
+            "message": message_to_dict(message) if message else None,
+            "text": generation.text,
+        })
+
+    def on_llm_error(self, error, *, run_id, **kwargs):
+        name, latency_ms = self._elapsed_ms(run_id)
+        self.write({"type": "llm", "name": name, "latency_ms": latency_ms, "error": repr(error)})
+
+    def on_tool_start(self, serialized, input_str, *, run_id, inputs=None, **kwargs):
+        self.started[run_id] = ((serialized or {}).get("name", "tool"), time.perf_counter())
+        # tool-calling agents pass {"__arg1": query}; keep the plain query for replay
+        if isinstance(inputs, dict) and len(inputs) == 1:
+            input_str = str(next(iter(inputs.values())))
+        self.started[(run_id, "input")] = input_str
+
+    def on_tool_end(self, output, *, run_id, **kwargs):
+        name, latency_ms = self._elapsed_ms(run_id)
+        tool_input = self.started.pop((run_id, "input"), "")
+        output = getattr(output, "content", output)
+        output = output if isinstance(output, str) else str(output)
+        self.write({
+            "type": "tool",
+            "name": name,
+            "latency_ms": latency_ms,
+            "input": tool_input,
+            "output": output,
+            "input_bytes": len(tool_input.encode("utf-8")),
+            "output_bytes": len(output.encode("utf-8")),
+        })
+
+    def on_tool_error(self, error, *, run_id, **kwargs):
+        name, latency_ms = self._elapsed_ms(run_id)
+        tool_input = self.started.pop((run_id, "input"), "")
+        self.write({"type": "tool", "name": name, "latency_ms": latency_ms,
+                    "input": tool_input, "error": repr(error)})
+
+
+class ReplayChatModel(BaseChatModel):
+    """Chat model that returns recorded responses in order, without any API calls."""
+
+    responses: List[BaseMessage]
+    position: int = 0
+
+    @property
+    def _llm_type(self) -> str:
+        return "replay"
+
+    def bind_tools(self, tools, **kwargs):
+        return self  # recorded messages already contain the tool calls
+
+    def _generate(self, messages, stop: Optional[List[str]] = None, run_manager=None, **kwargs: Any) -> ChatResult:
+        if self.position >= len(self.responses):
+            raise RuntimeError("replay trace has no more LLM responses")
+        message = self.responses[self.position]
+        self.position += 1
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+
+def replay_tool(tool, outputs: dict) -> Tool:
+    """Stand-in for `tool` that serves recorded outputs keyed by normalised input."""
+    def run(query: str) -> str:
+        recorded = outputs.get((tool.name, normalize(query)))
+        if not recorded:
+            raise KeyError(f"no recorded output for {tool.name}({query!r})")
+        return recorded.pop(0) if len(recorded) > 1 else recorded[0]
+
+    async def arun(query: str) -> str:
+        return run(query)
+
+    return Tool(name=tool.name, func=run, coroutine=arun, description=tool.description)
+
+
+def load_replay(path: str, tools: list):
+    """(query, ReplayChatModel, replay tools) rebuilt from a trace file."""
+    query, messages, outputs = None, [], defaultdict(list)
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            record = json.loads(line)
+            if record["type"] == "run":
+                if query is not None:
+                    break  # only the first run in the file
+                query = record["query"]
+            elif record["type"] == "llm" and record.get("message"):
+                messages.append(record["message"])
+            elif record["type"] == "tool" and "output" in record:
+                outputs[(record["name"], normalize(record["input"]))].append(record["output"])
+    llm = ReplayChatModel(responses=messages_from_dict(messages))
+    return query, llm, [replay_tool(tool, outputs) for tool in tools]
@@ -1,7 +1,11 @@
-from fastapi import FastAPI
+import time
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 from app.routes import jobs as jobs_router
 from app.routes import tailor as tailor_router
+from telemetry import timing
+from telemetry.metrics import HTTP_LATENCY, SAMPLE_RATE, render_prometheus
 
 
 app = FastAPI(title="Aule Job Bot", version="0.1.0")
@@ -16,10 +20,43 @@ app.add_middleware(
 )
 
 
+async def instrument(request: Request, call_next):
+    token = timing.start_request()
+    if token is None:
+        return await call_next(request)
+    start = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+    finally:
+        stages = timing.end_request(token)
+        elapsed = time.perf_counter() - start
+        route = request.scope.get("route")
+        HTTP_LATENCY.observe(
+            elapsed,
+            method=request.method,
+            route=route.path if route else "unmatched",
+            status=status,
+        )
+    response.headers["Server-Timing"] = timing.server_timing(stages, elapsed)
+    return response
+
+
+# BaseHTTPMiddleware wraps every request; skip it entirely when metrics are off
+if SAMPLE_RATE > 0:
+    app.middleware("http")(instrument)
+
+
 app.include_router(jobs_router.router, prefix="/jobs", tags=["jobs"])
 app.include_router(tailor_router.router, prefix="/tailor", tags=["tailor"])
 
 
 @app.get("/")
 def health():
-    return {"ok": True, "service": "Aule", "version": "0.1.0"}
\ No newline at end of file
+    return {"ok": True, "service": "Aule", "version": "0.1.0"}
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def metrics():
+    return PlainTextResponse(render_prometheus(), media_type="text/plain; version=0.0.4")
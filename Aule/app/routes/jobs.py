@@ -1,4 +1,4 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query
 from pydantic import BaseModel, Field
 from typing import Optional, List
 from db.sessions import SessionLocal
@@ -49,10 +49,14 @@ def create_job(payload: JobCreate):
 
 
 @router.get("/", response_model=List[JobOut])
-def list_jobs():
+def list_jobs(skill: Optional[str] = Query(None, description="Only jobs whose parsed skills include this")):
     db = SessionLocal()
     try:
-        jobs = db.query(models.Job).order_by(models.Job.id.desc()).all()
+        q = db.query(models.Job)
+        if skill:
+            # indexed lookup in job_skills instead of scanning description text
+            q = q.join(models.JobSkill).filter(models.JobSkill.skill == skill.lower())
+        jobs = q.order_by(models.Job.id.desc()).all()
         return jobs
     finally:
         db.close()
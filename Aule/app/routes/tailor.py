@@ -3,7 +3,8 @@ from pydantic import BaseModel
 from db.sessions import SessionLocal
 from db.models import Job
 from worker.llm_client import LLMClient
-from nlp import parser, scorer
+from nlp import scorer
+from nlp.prompt import build_cover_letter_prompt
 
 
 router = APIRouter()
@@ -17,6 +18,8 @@ class TailorRequest(BaseModel):
 class TailorResponse(BaseModel):
     cover_letter: str
     suitability_score: float
+    prompt_tokens: int
+    tokens_saved: int
 
 
 @router.post("/cover-letter", response_model=TailorResponse)
@@ -28,19 +31,18 @@ def generate_cover_letter(body: TailorRequest):
             raise HTTPException(404, "Job not found")
 
 
-        jd_struct = parser.parse_job_description(job.description)
+        jd_struct = job.features()
         score = scorer.suitability_score(body.resume_text, job.description)
 
 
-        prompt = (
-        f"You are a helpful assistant writing a one‑page cover letter.\n"
-        f"Job Title: {job.title}\nCompany: {job.company}\nLocation: {job.location or 'N/A'}\n"
-        f"Job Summary: {jd_struct['summary']}\nKey Requirements: {', '.join(jd_struct['requirements'])}\n\n"
-        f"Candidate Resume (raw):\n{body.resume_text}\n\n"
-        f"Write a concise, tailored cover letter in first person, professional but warm, using Canadian English."
-        )
         llm = LLMClient()
-        letter = llm.complete(prompt)
-        return TailorResponse(cover_letter=letter, suitability_score=score)
+        built = build_cover_letter_prompt(job, jd_struct, body.resume_text, llm.provider, llm.model)
+        letter = llm.complete(built["prompt"])
+        return TailorResponse(
+            cover_letter=letter,
+            suitability_score=score,
+            prompt_tokens=built["prompt_tokens"],
+            tokens_saved=built["tokens_saved"],
+        )
     finally:
         db.close()
\ No newline at end of file
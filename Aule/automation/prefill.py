@@ -1,8 +1,10 @@
 from nlp import parser, scorer
 
 
-def prefill_application(resume_text: str, job_description: str):
-    jd = parser.parse_job_description(job_description)
+def prefill_application(resume_text: str, job_description: str, jd: dict | None = None):
+    # pass `jd=job.features()` for stored jobs to skip reparsing
+    if jd is None:
+        jd = parser.parse_job_description(job_description)
     score = scorer.suitability_score(resume_text, job_description)
     bullets = [
         f"Experience matching: {', '.join(jd['requirements'][:3])}",
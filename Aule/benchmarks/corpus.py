@@ -0,0 +1,57 @@
+import random
+from typing import Dict, List
+
+
+# Deterministic synthetic job descriptions and resumes for benchmarks.
+
+SKILLS = ["Python", "Java", "C++", "TypeScript", "SQL", "Docker", "Kubernetes", "AWS",
+          "GCP", "Azure", "React", "FastAPI", "Django", "Rust", "ML", "NLP"]
+TITLES = ["Junior Software Developer", "Backend Engineer", "Data Engineer", "Full Stack Developer",
+          "ML Engineer", "Platform Engineer", "QA Automation Developer", "DevOps Engineer"]
+COMPANIES = ["NLS", "Maple Systems", "Northwind", "Lakeshore Labs", "Borealis", "Hudson Data"]
+CITIES = ["Toronto, ON", "Vancouver, BC", "Montreal, QC", "Ottawa, ON", "Calgary, AB", "Remote"]
+WORDS = ("team product customers build maintain services design review deploy scalable reliable "
+         "collaborate stakeholders mentor testing pipelines data quality performance cloud agile "
+         "ownership delivery roadmap features monitoring security documentation").split()
+
+
+def _sentence(rng: random.Random, n: int = 14) -> str:
+    words = [rng.choice(WORDS) for _ in range(n)]
+    if rng.random() < 0.5:
+        words.insert(rng.randrange(len(words)), rng.choice(SKILLS))
+    return " ".join(words).capitalize() + "."
+
+
+def job_description(rng: random.Random, chars: int = 2500) -> str:
+    lines = [f"{rng.choice(TITLES)} at {rng.choice(COMPANIES)}", ""]
+    while sum(len(ln) for ln in lines) < chars * 0.6:
+        lines.append(_sentence(rng))
+    lines += ["", "Requirements:"]
+    while sum(len(ln) for ln in lines) < chars:
+        lines.append(f"- Experience with {rng.choice(SKILLS)} and {rng.choice(SKILLS)}; {_sentence(rng, 8)}")
+    return "\n".join(lines)
+
+
+def resume(rng: random.Random, chars: int = 5000) -> str:
+    sections = ["Jane Doe\njane.doe@example.com | Toronto, ON"]
+    headings = ["Summary", "Skills", "Experience", "Projects", "Education", "Volunteering", "Interests"]
+    i = 0
+    while sum(len(s) for s in sections) < chars:
+        body = " ".join(_sentence(rng) for _ in range(rng.randint(2, 6)))
+        sections.append(f"{headings[i % len(headings)]}:\n{body}")
+        i += 1
+    return "\n\n".join(sections)
+
+
+def jobs(n: int, seed: int = 42, chars: int = 2500) -> List[Dict]:
+    rng = random.Random(seed)
+    return [
+        {
+            "title": rng.choice(TITLES),
+            "company": rng.choice(COMPANIES),
+            "location": rng.choice(CITIES),
+            "url": f"https://example.com/jobs/{i}",
+            "description": job_description(rng, chars),
+        }
+        for i in range(n)
+    ]
@@ -0,0 +1,175 @@
+"""
+Offline benchmarks for the nlp helpers and the API (SQLite + mock LLM).
+Running: `python -m benchmarks.run [--suite nlp|api|all] [--sizes 1000,10000,100000]
+                                    [--update-baseline] [--threshold 0.25]`
+Compares best-of-N timings against benchmarks/baseline.json and exits 1 on a regression.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# must be set before db/app are imported
+_DB_PATH = Path(tempfile.gettempdir()) / "aule_bench.db"
+os.environ["DATABASE_URL"] = f"sqlite:///{_DB_PATH}"
+os.environ["LLM_PROVIDER"] = "mock"
+
+from benchmarks import corpus  # noqa: E402
+
+BENCH_DIR = Path(__file__).parent
+DEFAULT_BASELINE = BENCH_DIR / "baseline.json"
+TEXT_SIZES = {"small": 1_000, "medium": 5_000, "large": 20_000}
+
+
+def measure(fn, repeat: int = 20, warmup: int = 2, min_sample_s: float = 0.005) -> dict:
+    """Per-call timings; fast calls are looped so each sample spans >= `min_sample_s`."""
+    for _ in range(warmup):
+        fn()
+    start = time.perf_counter()
+    fn()
+    loops = max(1, int(min_sample_s / max(time.perf_counter() - start, 1e-9)))
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        samples.append((time.perf_counter() - start) * 1000 / loops)
+    samples.sort()
+    return {
+        "min_ms": round(samples[0], 4),
+        "median_ms": round(statistics.median(samples), 4),
+        "p95_ms": round(samples[min(len(samples) - 1, int(len(samples) * 0.95))], 4),
+        "repeat": repeat,
+        "loops": loops,
+    }
+
+
+def bench_nlp() -> dict:
+    from nlp.parser import parse_job_description
+    from nlp.embeddings import embed, cosine
+    from nlp.scorer import suitability_score
+    from automation.prefill import prefill_application
+
+    results = {}
+    for label, chars in TEXT_SIZES.items():
+        rng = random.Random(chars)
+        jd = corpus.job_description(rng, chars)
+        cv = corpus.resume(rng, chars)
+        va, vb = embed(cv), embed(jd)
+        results[f"nlp.parse_job_description[{label}]"] = measure(lambda: parse_job_description(jd))
+        results[f"nlp.embed[{label}]"] = measure(lambda: embed(cv))
+        results[f"nlp.cosine[{label}]"] = measure(lambda: cosine(va, vb))
+        results[f"nlp.suitability_score[{label}]"] = measure(lambda: suitability_score(cv, jd))
+        results[f"automation.prefill_application[{label}]"] = measure(lambda: prefill_application(cv, jd))
+    return results
+
+
+def _load_jobs(n: int):
+    from sqlalchemy import delete, insert
+    from db.sessions import SessionLocal
+    from db.models import Job, JobSkill, parsed_columns
+
+    db = SessionLocal()
+    try:
+        db.execute(delete(JobSkill))
+        db.execute(delete(Job))
+        rows, skill_rows = [], []
+        for i, job in enumerate(corpus.jobs(n), start=1):
+            row = {"id": i, **job, **parsed_columns(job["description"])}
+            rows.append(row)
+            skill_rows += [{"job_id": i, "skill": s.lower()} for s in row["parsed_skills"]]
+        db.execute(insert(Job), rows)
+        db.execute(insert(JobSkill), skill_rows)
+        db.commit()
+    finally:
+        db.close()
+
+
+def bench_api(sizes) -> dict:
+    from fastapi.testclient import TestClient
+    from app.main import app
+
+    client = TestClient(app)
+    cv = corpus.resume(random.Random(7), TEXT_SIZES["medium"])
+    results = {}
+    for n in sizes:
+        start = time.perf_counter()
+        _load_jobs(n)
+        # setup cost is reported but not regression-checked (single noisy sample)
+        results[f"api.load_corpus[{n}]"] = {"elapsed_ms": round((time.perf_counter() - start) * 1000, 1)}
+
+        def call(method, url, **kw):
+            resp = client.request(method, url, **kw)
+            resp.raise_for_status()
+
+        repeat = 3 if n >= 100_000 else 10
+        results[f"api.GET /jobs[{n}]"] = measure(lambda: call("GET", "/jobs/"), repeat=repeat, warmup=1)
+        results[f"api.GET /jobs?skill[{n}]"] = measure(
+            lambda: call("GET", "/jobs/", params={"skill": "rust"}), repeat=repeat, warmup=1
+        )
+        results[f"api.POST /tailor/cover-letter[{n}]"] = measure(
+            lambda: call("POST", "/tailor/cover-letter", json={"job_id": n // 2, "resume_text": cv})
+        )
+    return results
+
+
+def check(results: dict, baseline: dict, threshold: float) -> list:
+    regressions = []
+    for name, base in baseline.get("results", {}).items():
+        cur = results.get(name)
+        # best-of-N is far less noisy than the median on shared machines
+        if not cur or "min_ms" not in base:
+            continue
+        if cur["min_ms"] > base["min_ms"] * (1 + threshold):
+            regressions.append((name, base["min_ms"], cur["min_ms"]))
+    return regressions
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="Aule offline benchmarks")
+    ap.add_argument("--suite", choices=["nlp", "api", "all"], default="all")
+    ap.add_argument("--sizes", default="1000,10000,100000", help="job corpus sizes for the api suite")
+    ap.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    ap.add_argument("--output", type=Path, help="also write this run's results to a JSON file")
+    ap.add_argument("--update-baseline", action="store_true", help="save this run as the new baseline")
+    ap.add_argument("--threshold", type=float, default=0.25, help="allowed slowdown vs baseline (0.25 = 25%%)")
+    args = ap.parse_args(argv)
+
+    results = {}
+    if args.suite in ("nlp", "all"):
+        results.update(bench_nlp())
+    if args.suite in ("api", "all"):
+        results.update(bench_api([int(s) for s in args.sizes.split(",") if s]))
+
+    for name, r in results.items():
+        extra = f"  p95 {r['p95_ms']:>10.3f} ms" if "p95_ms" in r else ""
+        print(f"{name:<48} {r.get('median_ms', r.get('elapsed_ms')):>10.3f} ms{extra}")
+
+    report = {"python": platform.python_version(), "machine": platform.machine(), "results": results}
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    if args.update_baseline:
+        args.baseline.write_text(json.dumps(report, indent=2), encoding="utf-8")
+        print(f"[bench] baseline written to {args.baseline}")
+        return 0
+    if not args.baseline.exists():
+        print("[bench] no baseline yet; run with --update-baseline to create one")
+        return 0
+
+    regressions = check(results, json.loads(args.baseline.read_text(encoding="utf-8")), args.threshold)
+    for name, base, cur in regressions:
+        print(f"[bench] REGRESSION {name}: {base:.3f} ms -> {cur:.3f} ms")
+    if regressions:
+        return 1
+    print(f"[bench] no regressions beyond {args.threshold:.0%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,14 +1,26 @@
-from sqlalchemy.orm import declarative_base
-from sqlalchemy import Column, Integer, String, Text
+from sqlalchemy.orm import declarative_base, relationship, validates
+from sqlalchemy import Column, ForeignKey, Integer, JSON, String, Text, inspect
 from db.sessions import engine
+from nlp import parser
 
 
 Base = declarative_base()
 
 
+def parsed_columns(description: str) -> dict:
+    """Parsed job features as column values (also used for bulk inserts)."""
+    jd = parser.parse_job_description(description)
+    return {
+        "parsed_summary": jd["summary"],
+        "parsed_requirements": jd["requirements"],
+        "parsed_skills": jd["skills"],
+        "parser_version": parser.PARSER_VERSION,
+    }
+
+
 class Job(Base):
     __tablename__ = "jobs"
-    
+
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String(200), nullable=False)
     company = Column(String(200), nullable=False)
@@ -16,6 +28,55 @@ class Job(Base):
     url = Column(String(500))
     description = Column(Text, nullable=False)
 
+    # parse_job_description output, materialised when the description is set
+    parsed_summary = Column(String(280))
+    parsed_requirements = Column(JSON)
+    parsed_skills = Column(JSON)
+    parser_version = Column(Integer, index=True)
+
+    skill_rows = relationship("JobSkill", cascade="all, delete-orphan")
+
+    @validates("description")
+    def _parse_description(self, key, description):
+        self.apply_features(parsed_columns(description))
+        return description
+
+    def apply_features(self, columns: dict):
+        for name, value in columns.items():
+            setattr(self, name, value)
+        self.skill_rows = [JobSkill(skill=s.lower()) for s in columns["parsed_skills"]]
+
+    def features(self) -> dict:
+        """Stored parse (summary/requirements/skills); reparses if the stamp is stale."""
+        if self.parser_version != parser.PARSER_VERSION:
+            return parser.parse_job_description(self.description)
+        return {
+            "summary": self.parsed_summary,
+            "requirements": self.parsed_requirements,
+            "skills": self.parsed_skills,
+        }
+
+
+class JobSkill(Base):
+    __tablename__ = "job_skills"
+
+    job_id = Column(Integer, ForeignKey("jobs.id", ondelete="CASCADE"), primary_key=True)
+    skill = Column(String(50), primary_key=True, index=True)
+
 
 # Simple one-time table creation for step 1 (replace with Alembic later)
-Base.metadata.create_all(bind=engine)
\ No newline at end of file
+Base.metadata.create_all(bind=engine)
+
+
+def _add_missing_job_columns():
+    # create_all won't alter an existing table; add the parsed-feature columns
+    # so scripts/backfill_features.py can fill them in
+    existing = {c["name"] for c in inspect(engine).get_columns("jobs")}
+    with engine.begin() as conn:
+        for col in Job.__table__.columns:
+            if col.name not in existing:
+                col_type = col.type.compile(dialect=engine.dialect)
+                conn.exec_driver_sql(f"ALTER TABLE jobs ADD COLUMN {col.name} {col_type}")
+
+
+_add_missing_job_columns()
@@ -1,7 +1,14 @@
 import re
 from typing import Dict, List
+from telemetry.timing import timed
 
 
+# Bump when the parsing rules change; stored job features with an older
+# stamp are reparsed by `scripts/backfill_features.py`.
+PARSER_VERSION = 1
+
+
+@timed("nlp.parse")
 def parse_job_description(text: str) -> Dict[str, List[str] | str]:
     # ultra-simple heuristics for step 1
     lines = [ln.strip() for ln in text.splitlines() if ln.strip()]
@@ -0,0 +1,213 @@
+import math
+import os
+import re
+from functools import lru_cache
+from typing import Dict, List, Tuple
+from telemetry.timing import timed
+
+
+# Token-budgeted prompt building for the tailoring endpoint.
+# Resume sections are ranked against the job's requirements/skills and only
+# the most relevant ones are kept; long requirement lists are trimmed too, so
+# prompt size (and LLM latency) stays bounded.
+
+DEFAULT_TOKEN_BUDGET = int(os.getenv("PROMPT_TOKEN_BUDGET", "1500"))
+# share of the budget held back for the resume however long the job's requirement list is
+MIN_RESUME_SHARE = float(os.getenv("PROMPT_MIN_RESUME_SHARE", "0.5"))
+
+# rough chars-per-token ratios when no tokenizer is available
+_CHARS_PER_TOKEN = {"openai": 4.0, "ollama": 3.5, "mock": 4.0}
+
+_WORD_RE = re.compile(r"[a-z0-9+#]+")
+_HEADING_RE = re.compile(r"^[A-Z][A-Za-z /&]{2,40}:?$")
+_STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "in", "is", "it",
+    "of", "on", "or", "our", "the", "to", "we", "with", "you", "your", "will", "have",
+    "experience", "knowledge", "good", "strong", "ability", "work", "required",
+}
+
+
+@lru_cache(maxsize=8)
+def _tiktoken_encoding(model: str):
+    try:
+        import tiktoken
+    except ImportError:
+        return None
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        return tiktoken.get_encoding("cl100k_base")
+
+
+def count_tokens(text: str, provider: str = "mock", model: str = "") -> int:
+    """Token count for `text` under the given provider/model.
+
+    Uses tiktoken for OpenAI models when installed, otherwise a per-provider
+    character ratio (good enough for budgeting).
+    """
+    if not text:
+        return 0
+    if provider == "openai":
+        enc = _tiktoken_encoding(model or "gpt-4o-mini")
+        if enc is not None:
+            return len(enc.encode(text))
+    ratio = _CHARS_PER_TOKEN.get(provider, 4.0)
+    return math.ceil(len(text) / ratio)
+
+
+def _keywords(text: str) -> set:
+    return {w for w in _WORD_RE.findall(text.lower()) if w not in _STOPWORDS and len(w) > 1}
+
+
+@lru_cache(maxsize=256)
+def split_resume_sections(resume_text: str) -> Tuple[Tuple[str, frozenset], ...]:
+    """Split a resume into (section_text, keywords) pairs, cached across requests."""
+    blocks = [b.strip() for b in re.split(r"\n\s*\n", resume_text) if b.strip()]
+    if len(blocks) <= 1:
+        # no blank-line structure: start a new section at each heading-like line
+        blocks, current = [], []
+        for ln in resume_text.splitlines():
+            if _HEADING_RE.match(ln.strip()) and current:
+                blocks.append("\n".join(current).strip())
+                current = []
+            if ln.strip():
+                current.append(ln)
+        if current:
+            blocks.append("\n".join(current).strip())
+    return tuple((b, frozenset(_keywords(b))) for b in blocks)
+
+
+def select_resume_sections(
+    resume_text: str,
+    requirements: List[str],
+    skills: List[str],
+    budget: int,
+    provider: str = "mock",
+    model: str = "",
+) -> str:
+    """Keep the resume sections most relevant to the job within `budget` tokens.
+
+    Sections are ranked by keyword overlap with the job's requirements and
+    skills (skills weigh double) and emitted in their original order.
+    """
+    sections = split_resume_sections(resume_text)
+    if budget <= 0 or not sections:
+        return ""
+    req_words = _keywords(" ".join(requirements))
+    skill_words = _keywords(" ".join(skills))
+
+    scored = []
+    for idx, (text, words) in enumerate(sections):
+        hits = len(words & req_words) + 2 * len(words & skill_words)
+        # first section is usually name/contact info; keep it cheap to include
+        score = hits / math.sqrt(len(words) or 1) + (1.0 if idx == 0 else 0.0)
+        scored.append((score, idx, text))
+
+    kept, used = [], 0
+    for score, idx, text in sorted(scored, key=lambda s: (-s[0], s[1])):
+        cost = count_tokens(text + "\n\n", provider, model)
+        if used + cost <= budget:
+            kept.append((idx, 0, text))
+            used += cost
+            continue
+        # too big as a whole (e.g. one long paragraph): keep the lines/sentences that fit
+        for sub_idx, piece in enumerate(_split_pieces(text)):
+            cost = count_tokens(piece + " ", provider, model)
+            if used + cost <= budget:
+                kept.append((idx, sub_idx, piece))
+                used += cost
+
+    if not kept:
+        # not even a single sentence fits: cut the best-ranked section down to the budget
+        best = max(scored, key=lambda s: (s[0], -s[1]))[2]
+        return _truncate(best, budget, provider, model)
+
+    parts, last_idx = [], None
+    for idx, _, text in sorted(kept):
+        if idx == last_idx:
+            parts[-1] += " " + text
+        else:
+            parts.append(text)
+        last_idx = idx
+    return "\n\n".join(parts)
+
+
+def _split_pieces(text: str) -> List[str]:
+    """Lines, then sentences within each line."""
+    pieces = []
+    for ln in text.splitlines():
+        pieces += [p for p in re.split(r"(?<=[.!?;])\s+", ln.strip()) if p]
+    return pieces
+
+
+def _truncate(text: str, budget: int, provider: str, model: str) -> str:
+    words = text.split()
+    # start from a proportional estimate, then trim until it fits
+    keep = max(1, len(words) * budget // max(count_tokens(text, provider, model), 1))
+    while keep > 1 and count_tokens(" ".join(words[:keep]), provider, model) > budget:
+        keep = int(keep * 0.9)
+    return " ".join(words[:keep])
+
+
+def select_requirements(
+    requirements: List[str],
+    budget: int,
+    provider: str = "mock",
+    model: str = "",
+) -> List[str]:
+    """Requirements, in order, that fit within `budget` tokens; ones that don't fit are skipped."""
+    kept, used = [], 0
+    for req in requirements:
+        cost = count_tokens(req + ", ", provider, model)
+        if used + cost <= budget:
+            kept.append(req)
+            used += cost
+    return kept
+
+
+@timed("prompt.build")
+def build_cover_letter_prompt(
+    job,
+    jd_struct: Dict,
+    resume_text: str,
+    provider: str = "mock",
+    model: str = "",
+    budget: int = DEFAULT_TOKEN_BUDGET,
+) -> Dict:
+    """Build the cover-letter prompt, trimming requirements and resume to fit `budget` tokens.
+
+    The requirement list may use whatever `MIN_RESUME_SHARE` of the budget
+    leaves over; the resume gets the rest, and never less than that share.
+
+    Returns {"prompt", "prompt_tokens", "tokens_saved"}.
+    """
+    job_info = (
+        f"You are a helpful assistant writing a one‑page cover letter.\n"
+        f"Job Title: {job.title}\nCompany: {job.company}\nLocation: {job.location or 'N/A'}\n"
+        f"Job Summary: {jd_struct['summary']}\nKey Requirements: "
+    )
+    footer = "Write a concise, tailored cover letter in first person, professional but warm, using Canadian English."
+    label = "Candidate Resume (relevant sections):\n"
+
+    resume_reserve = int(budget * MIN_RESUME_SHARE)
+    base = count_tokens(job_info + "\n\n" + label + footer, provider, model)
+    requirements = select_requirements(
+        jd_struct["requirements"], budget - resume_reserve - base, provider, model
+    )
+    header = f"{job_info}{', '.join(requirements)}\n\n"
+
+    fixed = count_tokens(header + label + footer, provider, model)
+    resume = select_resume_sections(
+        resume_text, jd_struct["requirements"], jd_struct["skills"],
+        max(budget - fixed, resume_reserve), provider, model,
+    )
+    prompt = f"{header}{label}{resume}\n\n{footer}"
+    prompt_tokens = count_tokens(prompt, provider, model)
+    full_tokens = count_tokens(
+        f"{job_info}{', '.join(jd_struct['requirements'])}\n\n{label}{resume_text}\n\n{footer}", provider, model
+    )
+    return {
+        "prompt": prompt,
+        "prompt_tokens": prompt_tokens,
+        "tokens_saved": max(0, full_tokens - prompt_tokens),
+    }
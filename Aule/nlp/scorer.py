@@ -1,6 +1,8 @@
 from nlp.embeddings import embed, cosine
+from telemetry.timing import timed
 
 
+@timed("nlp.score")
 def suitability_score(resume_text: str, job_text: str) -> float:
     # cosine similarity of mock embeddings → [0, 1]
     sim = cosine(embed(resume_text), embed(job_text))
@@ -0,0 +1,42 @@
+"""
+Reparse stored jobs whose parsed features are missing or stamped with an older
+parser version (or every job with --all).
+Running: `PYTHONPATH=. python scripts/backfill_features.py [--all] [--batch-size N]`
+"""
+import argparse
+from sqlalchemy import or_
+from db.sessions import SessionLocal
+from db.models import Job, parsed_columns
+from nlp.parser import PARSER_VERSION
+
+
+def backfill(reparse_all: bool = False, batch_size: int = 500) -> int:
+    db = SessionLocal()
+    updated = 0
+    last_id = 0
+    try:
+        while True:
+            q = db.query(Job).filter(Job.id > last_id)
+            if not reparse_all:
+                q = q.filter(or_(Job.parser_version.is_(None), Job.parser_version != PARSER_VERSION))
+            batch = q.order_by(Job.id).limit(batch_size).all()
+            if not batch:
+                break
+            for job in batch:
+                job.apply_features(parsed_columns(job.description))
+            db.commit()
+            updated += len(batch)
+            last_id = batch[-1].id
+            print(f"[backfill] reparsed {updated} jobs (up to id={last_id})")
+    finally:
+        db.close()
+    return updated
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--all", action="store_true", help="reparse every job, not just stale ones")
+    ap.add_argument("--batch-size", type=int, default=500)
+    args = ap.parse_args()
+    n = backfill(reparse_all=args.all, batch_size=args.batch_size)
+    print(f"[backfill] done: {n} jobs at parser version {PARSER_VERSION}")
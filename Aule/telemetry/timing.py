@@ -0,0 +1,66 @@
+import random
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from typing import Dict, Optional
+
+from telemetry.metrics import SAMPLE_RATE, STAGE_LATENCY
+
+
+# Per-request stage timings. The middleware installs a dict for sampled
+# requests; unsampled requests (or code outside a request) leave it None and
+# every timer below short-circuits.
+_stages: ContextVar[Optional[Dict[str, float]]] = ContextVar("aule_stages", default=None)
+
+
+def start_request():
+    """Begin collecting stages for this request if it is sampled; returns a reset token or None."""
+    if SAMPLE_RATE <= 0 or (SAMPLE_RATE < 1 and random.random() >= SAMPLE_RATE):
+        return None
+    return _stages.set({})
+
+
+def end_request(token) -> Dict[str, float]:
+    stages = _stages.get() or {}
+    _stages.reset(token)
+    return stages
+
+
+def record(name: str, seconds: float):
+    stages = _stages.get()
+    if stages is None:
+        return
+    stages[name] = stages.get(name, 0.0) + seconds
+    STAGE_LATENCY.observe(seconds, stage=name)
+
+
+@contextmanager
+def stage(name: str):
+    if _stages.get() is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(name, time.perf_counter() - start)
+
+
+def timed(name: str):
+    """Decorator form of `stage`."""
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            if _stages.get() is None:
+                return fn(*args, **kwargs)
+            with stage(name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def server_timing(stages: Dict[str, float], total: float) -> str:
+    parts = [f"{name};dur={secs * 1000:.2f}" for name, secs in stages.items()]
+    parts.append(f"total;dur={total * 1000:.2f}")
+    return ", ".join(parts)
@@ -1,5 +1,9 @@
 import os
+import time
 import httpx
+from nlp.prompt import count_tokens
+from telemetry import timing
+from telemetry.metrics import LLM_ERRORS, LLM_LATENCY, LLM_TOKENS
 
 
 class LLMClient:
@@ -8,14 +12,34 @@ class LLMClient:
         self.openai_key = os.getenv("OPENAI_API_KEY")
         self.ollama_host = os.getenv("OLLAMA_HOST", "http://localhost:11434")
         self.model = os.getenv("LLM_MODEL", "gpt-4o-mini")
+        # (prompt_tokens, completion_tokens) reported by the provider, if any
+        self.last_usage = None
 
 
     def complete(self, prompt: str) -> str:
         if self.provider == "openai" and self.openai_key:
-            return self._openai_complete(prompt)
-        if self.provider == "ollama":
-            return self._ollama_complete(prompt)
-        return self._mock_complete(prompt)
+            provider, call = "openai", self._openai_complete
+        elif self.provider == "ollama":
+            provider, call = "ollama", self._ollama_complete
+        else:
+            provider, call = "mock", self._mock_complete
+
+        self.last_usage = None
+        start = time.perf_counter()
+        try:
+            with timing.stage("llm"):
+                text = call(prompt)
+        except Exception:
+            LLM_ERRORS.inc(provider=provider)
+            raise
+        LLM_LATENCY.observe(time.perf_counter() - start, provider=provider)
+        prompt_tokens, completion_tokens = self.last_usage or (
+            count_tokens(prompt, provider, self.model),
+            count_tokens(text, provider, self.model),
+        )
+        LLM_TOKENS.inc(prompt_tokens, provider=provider, kind="prompt")
+        LLM_TOKENS.inc(completion_tokens, provider=provider, kind="completion")
+        return text
 
 
     def _mock_complete(self, prompt: str) -> str:
@@ -43,6 +67,9 @@ class LLMClient:
             resp = client.post(url, headers=headers, json=json)
             resp.raise_for_status()
             data = resp.json()
+            usage = data.get("usage")
+            if usage:
+                self.last_usage = (usage["prompt_tokens"], usage["completion_tokens"])
             return data["choices"][0]["message"]["content"].strip()
 
 
@@ -55,4 +82,6 @@ class LLMClient:
             )
             resp.raise_for_status()
             data = resp.json()
+            if "prompt_eval_count" in data:
+                self.last_usage = (data["prompt_eval_count"], data.get("eval_count", 0))
             return data.get("response", "").strip()
\ No newline at end of file
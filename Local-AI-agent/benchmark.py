@@ -0,0 +1,179 @@
+"""Offline retrieval benchmark for the Chroma HNSW index.
+
+Builds synthetic review corpora with a deterministic local embedding (no
+Ollama needed), then reports index build time, p50/p95 query latency and
+recall@k against exact brute-force search for each HNSW setting.
+
+    python benchmark.py --sizes 10000,100000 --m 16,32 --search-ef 10,50,100
+    python benchmark.py --sizes 1000000 --dim 128 --output results.json
+"""
+import argparse
+import hashlib
+import json
+import shutil
+import tempfile
+import time
+import chromadb
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+WORDS = """pizza crust cheese sauce pepperoni delivery service staff waiter wait slow fast hot cold
+    fresh soggy crispy chewy burnt oven wood fired margherita basil mozzarella garlic knots salad
+    wings pasta dessert tiramisu price expensive cheap value portion friendly rude manager order
+    wrong late early table reservation music atmosphere cozy loud clean dirty parking takeout
+    vegan gluten free toppings mushrooms olives onions peppers sausage anchovies pineapple ranch
+    dough thin thick slice box driver tip coupon deal family kids birthday date night lunch""".split()
+
+
+class HashEmbeddings(Embeddings):
+    """Deterministic stand-in for mxbai-embed-large: each word gets a fixed
+    random vector (seeded by its hash) and a text is the normalised sum."""
+
+    def __init__(self, dim=128):
+        self.dim = dim
+        self._vectors = {}
+
+    def word_vector(self, word):
+        vec = self._vectors.get(word)
+        if vec is None:
+            seed = int.from_bytes(hashlib.sha1(word.encode("utf-8")).digest()[:8], "little")
+            vec = self._vectors[word] = np.random.default_rng(seed).standard_normal(self.dim).astype(np.float32)
+        return vec
+
+    def _embed(self, text):
+        vec = sum((self.word_vector(w) for w in text.lower().split()), np.zeros(self.dim, np.float32))
+        return (vec / (np.linalg.norm(vec) or 1.0)).tolist()
+
+    def embed_documents(self, texts):
+        return [self._embed(t) for t in texts]
+
+    def embed_query(self, text):
+        return self._embed(text)
+
+
+def synthetic_corpus(n, embedder, seed=0, length=30):
+    """(n, dim) float32 review embeddings; word choice follows a Zipf-like distribution.
+
+    Built from word ids with numpy so 1M rows take seconds; equivalent to
+    embedding the generated text with `embedder`.
+    """
+    rng = np.random.default_rng(seed)
+    weights = 1.0 / np.arange(1, len(WORDS) + 1)
+    table = np.stack([embedder.word_vector(w) for w in WORDS])
+    vectors = np.zeros((n, embedder.dim), np.float32)
+    block = 50_000
+    for start in range(0, n, block):
+        ids = rng.choice(len(WORDS), size=(min(block, n - start), length), p=weights / weights.sum())
+        # per-row word counts times the word table: a (rows, vocab) temporary
+        # instead of materialising (rows, length, dim) word vectors
+        rows = np.repeat(np.arange(len(ids)), length)
+        counts = np.bincount(rows * len(WORDS) + ids.ravel(), minlength=len(ids) * len(WORDS))
+        summed = counts.reshape(len(ids), len(WORDS)).astype(np.float32) @ table
+        vectors[start:start + block] = summed / np.linalg.norm(summed, axis=1, keepdims=True)
+    return vectors
+
+
+def synthetic_queries(n, embedder, seed=1):
+    rng = np.random.default_rng(seed)
+    texts = [" ".join(rng.choice(WORDS, size=rng.integers(3, 8))) for _ in range(n)]
+    return np.asarray(embedder.embed_documents(texts), np.float32)
+
+
+def exact_top_k(corpus, queries, k):
+    """Brute-force nearest neighbours (vectors are normalised, so dot product ranks like L2)."""
+    top = np.empty((len(queries), k), np.int64)
+    for start in range(0, len(queries), 64):
+        scores = queries[start:start + 64] @ corpus.T
+        part = np.argpartition(-scores, k, axis=1)[:, :k]
+        order = np.take_along_axis(scores, part, axis=1).argsort(axis=1)[:, ::-1]
+        top[start:start + 64] = np.take_along_axis(part, order, axis=1)
+    return top
+
+
+def build_collection(client, corpus, m, construction_ef):
+    name = f"bench_m{m}_ef{construction_ef}"
+    try:
+        client.delete_collection(name)
+    except Exception:
+        pass
+    collection = client.create_collection(
+        name, metadata={"hnsw:M": m, "hnsw:construction_ef": construction_ef}, embedding_function=None
+    )
+    batch = client.get_max_batch_size()
+    start = time.perf_counter()
+    for i in range(0, len(corpus), batch):
+        collection.add(
+            ids=[str(j) for j in range(i, min(i + batch, len(corpus)))],
+            embeddings=corpus[i:i + batch],
+        )
+    return collection, time.perf_counter() - start
+
+
+def run_queries(collection, queries, exact, k):
+    latencies, recalls = [], []
+    for query, truth in zip(queries, exact):
+        start = time.perf_counter()
+        result = collection.query(query_embeddings=[query], n_results=k, include=[])
+        latencies.append(time.perf_counter() - start)
+        found = {int(i) for i in result["ids"][0]}
+        recalls.append(len(found & set(truth.tolist())) / k)
+    latencies = np.asarray(latencies) * 1000
+    return {
+        "recall_at_k": round(float(np.mean(recalls)), 4),
+        "p50_ms": round(float(np.percentile(latencies, 50)), 3),
+        "p95_ms": round(float(np.percentile(latencies, 95)), 3),
+    }
+
+
+def _ints(value):
+    return [int(v) for v in value.split(",") if v]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=_ints, default=[10_000, 100_000], help="corpus sizes (up to 1000000)")
+    parser.add_argument("--dim", type=int, default=128, help="embedding size (mxbai-embed-large is 1024)")
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=5)
+    parser.add_argument("--m", type=_ints, default=[16])
+    parser.add_argument("--construction-ef", type=_ints, default=[100])
+    parser.add_argument("--search-ef", type=_ints, default=[10, 50, 100])
+    parser.add_argument("--output", help="write results as JSON")
+    args = parser.parse_args()
+
+    embedder = HashEmbeddings(args.dim)
+    queries = synthetic_queries(args.queries, embedder)
+    workdir = tempfile.mkdtemp(prefix="chroma_bench_")
+    client = chromadb.PersistentClient(path=workdir)
+    results = []
+    print(f"{'rows':>8} {'M':>4} {'c_ef':>5} {'s_ef':>5} {'build_s':>8} {'recall@k':>9} {'p50_ms':>8} {'p95_ms':>8}")
+    try:
+        for size in args.sizes:
+            corpus = synthetic_corpus(size, embedder)
+            exact = exact_top_k(corpus, queries, args.k)
+            for m in args.m:
+                for construction_ef in args.construction_ef:
+                    collection, build_s = build_collection(client, corpus, m, construction_ef)
+                    for search_ef in args.search_ef:
+                        collection.modify(configuration={"hnsw": {"ef_search": search_ef}})
+                        # a loaded index keeps its old ef_search; reopen so the change applies
+                        client.clear_system_cache()
+                        client = chromadb.PersistentClient(path=workdir)
+                        collection = client.get_collection(collection.name)
+                        row = {"rows": size, "M": m, "construction_ef": construction_ef,
+                               "search_ef": search_ef, "build_s": round(build_s, 2),
+                               **run_queries(collection, queries, exact, args.k)}
+                        results.append(row)
+                        print(f"{size:>8} {m:>4} {construction_ef:>5} {search_ef:>5} {build_s:>8.2f} "
+                              f"{row['recall_at_k']:>9.4f} {row['p50_ms']:>8.3f} {row['p95_ms']:>8.3f}")
+                    client.delete_collection(collection.name)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"k": args.k, "dim": args.dim, "queries": args.queries, "results": results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+import json
+import os
+import re
+import sqlite3
+import time
+import numpy as np
+
+cache_path = os.getenv("QA_CACHE_PATH", "./qa_cache.sqlite3")
+similarity_threshold = float(os.getenv("QA_CACHE_SIMILARITY", "0.95"))
+max_entries = int(os.getenv("QA_CACHE_MAX_ENTRIES", "1000"))
+
+
+def normalize(question):
+    """Lowercase, drop punctuation and collapse whitespace."""
+    return " ".join(re.sub(r"[^\w\s]", " ", question.lower()).split())
+
+
+class QACache:
+    """Persistent two-level cache for the Q&A loop.
+
+    Level 1 maps a normalised question to its query embedding and the ids of
+    the reviews retrieved for it. Level 2 stores answers and serves one when
+    a new question's embedding is within `threshold` cosine similarity of a
+    cached question asked with the same retrieval scope (its rating/date
+    filter), so "1-star" and "5-star" variants never share an answer. Both
+    levels carry a fingerprint of the reviews they were built from and are
+    ignored once those reviews change. Each level keeps at most `max_entries`
+    rows, evicting the least recently used.
+    """
+
+    def __init__(self, path=cache_path, threshold=similarity_threshold, max_entries=max_entries):
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.db.executescript("""
+            CREATE TABLE IF NOT EXISTS queries (
+                question TEXT PRIMARY KEY, embedding BLOB, review_ids TEXT,
+                fingerprint TEXT, last_used REAL);
+            CREATE TABLE IF NOT EXISTS answers (
+                question TEXT PRIMARY KEY, embedding BLOB, review_ids TEXT,
+                fingerprint TEXT, answer TEXT, last_used REAL, scope TEXT);
+        """)
+
+    def get_query(self, question, fingerprint):
+        """(embedding, review_ids) for an exact normalised question, or None."""
+        key = normalize(question)
+        row = self.db.execute(
+            "SELECT embedding, review_ids, fingerprint FROM queries WHERE question = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        embedding, review_ids, stored_fp = row
+        review_ids = json.loads(review_ids)
+        if fingerprint(review_ids) != stored_fp:
+            self.db.execute("DELETE FROM queries WHERE question = ?", (key,))
+            self.db.commit()
+            return None
+        self._touch("queries", key)
+        return np.frombuffer(embedding, dtype=np.float32).tolist(), review_ids
+
+    def put_query(self, question, embedding, review_ids, fingerprint):
+        self._put("queries", normalize(question), embedding, review_ids, fingerprint)
+
+    def get_answer(self, embedding, fingerprint, scope=None):
+        """(answer, similarity) of the closest cached question in `scope` above the threshold, or None."""
+        rows = self.db.execute(
+            "SELECT question, embedding, review_ids, fingerprint, answer FROM answers WHERE scope = ?",
+            (json.dumps(scope, sort_keys=True),),
+        ).fetchall()
+        if not rows:
+            return None
+        matrix = np.stack([np.frombuffer(r[1], dtype=np.float32) for r in rows])
+        query = np.asarray(embedding, dtype=np.float32)
+        sims = matrix @ query / (np.linalg.norm(matrix, axis=1) * np.linalg.norm(query) + 1e-12)
+        best = int(np.argmax(sims))
+        if sims[best] < self.threshold:
+            return None
+        key, _, review_ids, stored_fp, answer = rows[best]
+        if fingerprint(json.loads(review_ids)) != stored_fp:
+            self.db.execute("DELETE FROM answers WHERE question = ?", (key,))
+            self.db.commit()
+            return None
+        self._touch("answers", key)
+        return answer, float(sims[best])
+
+    def put_answer(self, question, embedding, review_ids, fingerprint, answer, scope=None):
+        self._put("answers", normalize(question), embedding, review_ids, fingerprint,
+                  answer=answer, scope=json.dumps(scope, sort_keys=True))
+
+    def _put(self, table, key, embedding, review_ids, fingerprint, **extra):
+        row = {
+            "question": key,
+            "embedding": np.asarray(embedding, dtype=np.float32).tobytes(),
+            "review_ids": json.dumps(review_ids),
+            "fingerprint": fingerprint(review_ids),
+            **extra,
+            "last_used": time.time(),
+        }
+        self.db.execute(
+            f"INSERT OR REPLACE INTO {table} ({', '.join(row)}) VALUES ({', '.join('?' * len(row))})",
+            tuple(row.values()),
+        )
+        self.db.execute(
+            f"DELETE FROM {table} WHERE question NOT IN "
+            f"(SELECT question FROM {table} ORDER BY last_used DESC LIMIT ?)",
+            (self.max_entries,),
+        )
+        self.db.commit()
+
+    def _touch(self, table, key):
+        self.db.execute(f"UPDATE {table} SET last_used = ? WHERE question = ?", (time.time(), key))
+        self.db.commit()
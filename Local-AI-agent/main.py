@@ -1,8 +1,19 @@
+import argparse
+import threading
+import time
 from langchain_ollama import OllamaLLM
 from langchain_core.prompts import ChatPromptTemplate
-from vector import retriever
+from vector import embeddings, vector_store, reviews_fingerprint, keep_alive
+from cache import QACache
+from retrieval import HybridRetriever
 
-model = OllamaLLM(model="llama3.2")
+parser = argparse.ArgumentParser(description="Ask questions about the restaurant reviews")
+parser.add_argument("--no-stream", action="store_true", help="print answers only once complete")
+args = parser.parse_args()
+
+model = OllamaLLM(model="llama3.2", keep_alive=keep_alive)
+cache = QACache()
+retriever = HybridRetriever(vector_store, embeddings)
 
 template = """
 You are an expert in answering questions about a pizza restaurant
@@ -12,14 +23,80 @@ Here is the question to answer: {question}
 prompt = ChatPromptTemplate.from_template(template)
 chain = prompt | model
 
+
+def warm_up():
+    """Load both models in the background so the first question doesn't pay for it.
+
+    Runs while the user is typing; the first retrieval then overlaps with the
+    (slower) LLM load instead of waiting behind it.
+    """
+    def quietly(fn, *fn_args):
+        try:
+            fn(*fn_args)
+        except Exception as e:  # the real request will surface the error
+            print(f"[warm-up failed: {e}]")
+
+    warm_model = OllamaLLM(model="llama3.2", keep_alive=keep_alive, num_predict=1)
+    for fn, text in ((embeddings.embed_query, "warm-up"), (warm_model.invoke, "hi")):
+        threading.Thread(target=quietly, args=(fn, text), daemon=True).start()
+
+
+def generate(reviews, question):
+    """Answer text and time to first token; streams to stdout unless --no-stream."""
+    start = time.perf_counter()
+    if args.no_stream:
+        result = chain.invoke({"reviews": reviews, "question": question})
+        print(result, end="")
+        return result, time.perf_counter() - start
+    parts, first_token = [], None
+    for chunk in chain.stream({"reviews": reviews, "question": question}):
+        if first_token is None:
+            first_token = time.perf_counter() - start
+        parts.append(chunk)
+        print(chunk, end="", flush=True)
+    return "".join(parts), first_token or 0.0
+
+
+def embed(question):
+    """Query embedding plus cached review ids for a repeat question (None otherwise)."""
+    cached = cache.get_query(question, reviews_fingerprint)
+    if cached:
+        return cached
+    return embeddings.embed_query(question), None
+
+
+def retrieve(question, embedding, ids):
+    """Top reviews for the question, reusing the cached ids when there are any."""
+    if ids is not None:
+        by_id = {doc.id: doc for doc in vector_store.get_by_ids(ids)}
+        return [by_id[i] for i in ids if i in by_id]
+    reviews = retriever.invoke(question, embedding=embedding)
+    cache.put_query(question, embedding, [doc.id for doc in reviews], reviews_fingerprint)
+    return reviews
+
+
+warm_up()
+
 while True:
     print("\n\n-------------------------------------")
     question = input("Ask your question (q to quit): ")
     print("\n\n")
     if question == "q":
         break
-    
-    reviews = retriever.invoke(question)
-    result = chain.invoke({"reviews": reviews, "question": question})
-    print(result)
-    print("\n\n-------------------------------------")
\ No newline at end of file
+
+    start = time.perf_counter()
+    embedding, ids = embed(question)
+    where = retriever.plan(question)[0]
+    # a semantically cached answer needs no retrieval at all
+    hit = cache.get_answer(embedding, reviews_fingerprint, scope=where)
+    if hit:
+        result, similarity = hit
+        print(result)
+        print(f"\n[cache hit: answer, similarity {similarity:.3f}, {(time.perf_counter() - start) * 1000:.0f} ms]")
+    else:
+        reviews = retrieve(question, embedding, ids)
+        result, first_token = generate(reviews, question)
+        cache.put_answer(question, embedding, [doc.id for doc in reviews], reviews_fingerprint, result, scope=where)
+        print(f"\n\n[cache {'hit: query' if ids is not None else 'miss'}, first token {first_token * 1000:.0f} ms, "
+              f"{(time.perf_counter() - start) * 1000:.0f} ms]")
+    print("\n\n-------------------------------------")
@@ -0,0 +1,189 @@
+import heapq
+import math
+import re
+from collections import Counter, defaultdict
+from datetime import date, timedelta
+from operator import itemgetter
+
+# Hybrid retrieval: rating/date constraints in the question become Chroma
+# `where` filters, and BM25 over the review text is fused with the vector
+# search using reciprocal rank fusion.
+
+rrf_k = 60
+recent_days = 90
+
+_WORD_RE = re.compile(r"[a-z0-9']+")
+_STOPWORDS = set("""a an and are as at be but by do does for from has have how i in is it its
+    me my of on or our reviews review say says said that the their them there they this to
+    us was we were what when where which who why with you your about any some""".split())
+_NUMBER_WORDS = {"one": 1, "two": 2, "three": 3, "four": 4, "five": 5}
+_RATING = r"([1-5]|one|two|three|four|five)"  # ratings run 1-5
+_STARS = r"\b" + _RATING + r"[\s-]*stars?\b"
+# "4 or 5 stars", "3 to 5 stars", "2-4 stars"
+_RATING_RANGE_RE = re.compile(r"\b" + _RATING + r"\s*(?:or|to|-)\s*" + _STARS)
+# (pattern, operator), first match wins: negated phrases ("no more than") come
+# before the phrases they contain ("more than")
+_RATING_BOUNDS = [(re.compile(pattern), op) for pattern, op in (
+    (_STARS + r"\s*(?:and|or)\s*(?:above|up|higher|more|better)", "$gte"),
+    (_STARS + r"\s*(?:and|or)\s*(?:below|under|lower|less|fewer|worse)", "$lte"),
+    (r"\b(?:at most|up to|no more than|not more than|no higher than)\s*" + _STARS, "$lte"),
+    (r"\b(?:at least|no less than|no fewer than|not less than|no lower than)\s*" + _STARS, "$gte"),
+    (r"\b(?:below|under|less than|fewer than|lower than)\s*" + _STARS, "$lt"),
+    (r"\b(?:above|over|more than|higher than)\s*" + _STARS, "$gt"),
+    (_STARS, "$eq"),
+)]
+_BROAD_RE = re.compile(r"\b(summar\w*|overall|trends?|common|most|main|all|general\w*)\b")
+
+
+def tokenize(text):
+    return [w for w in _WORD_RE.findall(text.lower()) if w not in _STOPWORDS]
+
+
+def _stars(value):
+    return _NUMBER_WORDS.get(value) or int(value)
+
+
+def _ord(d):
+    return d.year * 10000 + d.month * 100 + d.day
+
+
+def _from_ord(value):
+    return date(value // 10000, value // 100 % 100, value % 100)
+
+
+def parse_constraints(question, latest_date_ord):
+    """Rating and date constraints mentioned in the question, as Chroma conditions.
+
+    Relative dates ("recent", "last 3 months") are measured from the newest
+    review rather than today, so they keep working on a historical dataset.
+    """
+    q = question.lower()
+    conditions = []
+
+    m_range = _RATING_RANGE_RE.search(q)
+    if m_range:
+        low, high = sorted((_stars(m_range.group(1)), _stars(m_range.group(2))))
+        conditions.append({"rating": {"$gte": low}})
+        conditions.append({"rating": {"$lte": high}})
+    else:
+        for pattern, op in _RATING_BOUNDS:
+            m = pattern.search(q)
+            if m:
+                conditions.append({"rating": {op: _stars(m.group(1))}})
+                break
+
+    if latest_date_ord:
+        latest = _from_ord(latest_date_ord)
+        m_last = re.search(r"(?:last|past)\s+(\d+)?\s*(day|week|month|year)s?", q)
+        m_year = re.search(r"\b(?:in|during|from)\s+(20\d\d)\b", q)
+        m_after = re.search(r"\b(?:since|after)\s+(\d{4}-\d{2}(?:-\d{2})?)", q)
+        m_before = re.search(r"\bbefore\s+(\d{4}-\d{2}(?:-\d{2})?)", q)
+        if m_last:
+            n = int(m_last.group(1) or 1)
+            days = {"day": 1, "week": 7, "month": 30, "year": 365}[m_last.group(2)]
+            conditions.append({"date_ord": {"$gte": _ord(latest - timedelta(days=n * days))}})
+        elif re.search(r"\b(recent|recently|latest|lately|newest)\b", q):
+            conditions.append({"date_ord": {"$gte": _ord(latest - timedelta(days=recent_days))}})
+        if m_year:
+            year = int(m_year.group(1))
+            conditions.append({"date_ord": {"$gte": year * 10000 + 101}})
+            conditions.append({"date_ord": {"$lte": year * 10000 + 1231}})
+        if m_after:
+            conditions.append({"date_ord": {"$gte": int((m_after.group(1) + "-01")[:10].replace("-", ""))}})
+        if m_before:
+            conditions.append({"date_ord": {"$lt": int((m_before.group(1) + "-01")[:10].replace("-", ""))}})
+
+    if not conditions:
+        return None
+    return conditions[0] if len(conditions) == 1 else {"$and": conditions}
+
+
+def matches(metadata, where):
+    """Evaluate a Chroma-style `where` filter against one metadata dict."""
+    if where is None:
+        return True
+    if "$and" in where:
+        return all(matches(metadata, c) for c in where["$and"])
+    (field, cond), = where.items()
+    value = metadata.get(field)
+    if value is None:
+        return False
+    (op, target), = cond.items()
+    return {
+        "$eq": value == target, "$gt": value > target, "$gte": value >= target,
+        "$lt": value < target, "$lte": value <= target,
+    }[op]
+
+
+class BM25Index:
+    """In-memory BM25 (Okapi) over the review texts, using an inverted index."""
+
+    def __init__(self, ids, texts, metadatas, k1=1.5, b=0.75):
+        self.ids = ids
+        self.metadatas = metadatas
+        self.k1, self.b = k1, b
+        self.postings = defaultdict(list)
+        self.lengths = []
+        for i, text in enumerate(texts):
+            terms = tokenize(text)
+            self.lengths.append(len(terms))
+            for term, tf in Counter(terms).items():
+                self.postings[term].append((i, tf))
+        self.avg_len = (sum(self.lengths) / len(self.lengths)) if self.lengths else 0.0
+
+    def search(self, query, k, where=None):
+        """Top-k review ids for the query, restricted to rows matching `where`."""
+        n = len(self.lengths)
+        scores = defaultdict(float)
+        allowed = {}  # row -> matches(where), evaluated once per row
+        for term in set(tokenize(query)):
+            docs = self.postings.get(term)
+            if not docs:
+                continue
+            idf = math.log(1 + (n - len(docs) + 0.5) / (len(docs) + 0.5))
+            for i, tf in docs:
+                if where is not None:
+                    if i not in allowed:
+                        allowed[i] = matches(self.metadatas[i], where)
+                    if not allowed[i]:
+                        continue
+                norm = self.k1 * (1 - self.b + self.b * self.lengths[i] / self.avg_len)
+                scores[i] += idf * tf * (self.k1 + 1) / (tf + norm)
+        return [self.ids[i] for i, _ in heapq.nlargest(k, scores.items(), key=itemgetter(1))]
+
+
+class HybridRetriever:
+    """Filtered vector search fused with BM25; `invoke` returns Documents like a retriever."""
+
+    def __init__(self, vector_store, embeddings, k=5, broad_k=10, fetch_factor=4):
+        self.vector_store = vector_store
+        self.embeddings = embeddings
+        self.k, self.broad_k, self.fetch_factor = k, broad_k, fetch_factor
+        data = vector_store.get(include=["documents", "metadatas"])
+        self.bm25 = BM25Index(data["ids"], data["documents"], data["metadatas"])
+        self.latest_date_ord = max((m.get("date_ord", 0) for m in data["metadatas"]), default=0)
+
+    def plan(self, question):
+        """(where, k, fetch_k) for a question."""
+        where = parse_constraints(question, self.latest_date_ord)
+        k = self.broad_k if _BROAD_RE.search(question.lower()) else self.k
+        return where, k, k * self.fetch_factor
+
+    def invoke(self, question, embedding=None):
+        where, k, fetch_k = self.plan(question)
+        if embedding is None:
+            embedding = self.embeddings.embed_query(question)
+        vector_docs = self.vector_store.similarity_search_by_vector(embedding, k=fetch_k, filter=where)
+        lexical_ids = self.bm25.search(question, fetch_k, where)
+
+        fused = defaultdict(float)
+        for ranking in ([doc.id for doc in vector_docs], lexical_ids):
+            for rank, id_ in enumerate(ranking):
+                fused[id_] += 1.0 / (rrf_k + rank + 1)
+        top = sorted(fused, key=lambda id_: -fused[id_])[:k]
+
+        docs = {doc.id: doc for doc in vector_docs}
+        missing = [id_ for id_ in top if id_ not in docs]
+        if missing:
+            docs.update((doc.id, doc) for doc in self.vector_store.get_by_ids(missing))
+        return [docs[id_] for id_ in top if id_ in docs]
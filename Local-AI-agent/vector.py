@@ -1,37 +1,164 @@
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from langchain_ollama import OllamaEmbeddings
 from langchain_chroma import Chroma
-from langchain_core.documents import Document
+import hashlib
+import json
 import os
 import pandas as pd
 
-df = pd.read_csv("realistic_restaurant_reviews.csv")
-embeddings = OllamaEmbeddings(model="mxbai-embed-large")
-
+csv_path = os.getenv("REVIEWS_CSV", "realistic_restaurant_reviews.csv")
 db_location = "./chroma_langchain_db"
-add_documents = not os.path.exists(db_location)
-
-if add_documents:
-    documents = []
-    ids = []
-    
-    for i, row in df.iterrows():
-        document = Document(
-            page_content=row["Title"] + " " + row["Review"],
-            metadata = {"rating": row["Rating"], "date": row["Date"]},
-            id=str(i)
-        )
-        ids.append(str(i))
-        documents.append(document)
+
+# Ingestion tuning: CSV rows read per chunk, texts per embedding request,
+# and how many embedding requests may be in flight to Ollama at once.
+chunk_size = int(os.getenv("INGEST_CHUNK_SIZE", "1000"))
+embed_batch_size = int(os.getenv("EMBED_BATCH_SIZE", "64"))
+embed_concurrency = int(os.getenv("EMBED_CONCURRENCY", "4"))
+
+# Seconds Ollama keeps a model loaded after its last request (Ollama's own default is 300).
+keep_alive = int(os.getenv("OLLAMA_KEEP_ALIVE", "1800"))
+
+embeddings = OllamaEmbeddings(model="mxbai-embed-large", keep_alive=keep_alive)
+
+# HNSW index settings; unset ones keep Chroma's defaults (M=16, construction_ef=100,
+# search_ef=100). M and construction_ef only take effect when the collection is
+# created; search_ef is also applied to an existing one. Use benchmark.py to pick values.
+hnsw_settings = {
+    key: int(os.environ[env])
+    for key, env in (("M", "HNSW_M"), ("construction_ef", "HNSW_CONSTRUCTION_EF"), ("search_ef", "HNSW_SEARCH_EF"))
+    if os.getenv(env)
+}
 
 vector_store = Chroma(
     collection_name="restaurant_reviews",
     persist_directory=db_location,
-    embedding_function=embeddings
+    embedding_function=embeddings,
+    collection_metadata={f"hnsw:{key}": value for key, value in hnsw_settings.items()} or None,
 )
+if "search_ef" in hnsw_settings:
+    vector_store._collection.modify(configuration={"hnsw": {"ef_search": hnsw_settings["search_ef"]}})
+
+
+def read_reviews(path=csv_path, chunksize=chunk_size):
+    """Yield (id, text, metadata) per CSV row, reading the file in chunks.
+
+    Ids are the CSV's `Id` column when present, otherwise derived from the
+    review text so they stay stable when rows are inserted or removed;
+    repeats of the same text get an occurrence suffix ("<hash>-2", ...) so
+    they are kept as separate reviews. `content_hash` covers the embedded
+    text only, so rating/date edits don't trigger a re-embed. Rows without
+    a usable rating or date simply omit it from the metadata.
+    """
+    occurrences = Counter()
+    for chunk in pd.read_csv(path, chunksize=chunksize):
+        texts = chunk["Title"].astype(str) + " " + chunk["Review"].astype(str)
+        hashes = [hashlib.sha1(text.encode("utf-8")).hexdigest() for text in texts]
+        if "Id" in chunk.columns:
+            ids = chunk["Id"].astype(str)
+        else:
+            ids = []
+            for h in hashes:
+                occurrences[h] += 1
+                ids.append(h[:16] if occurrences[h] == 1 else f"{h[:16]}-{occurrences[h]}")
+        ratings = pd.to_numeric(chunk["Rating"], errors="coerce")
+        # YYYYMMDD integer so Chroma `where` filters can range over dates
+        parsed = pd.to_datetime(chunk["Date"], errors="coerce")
+        date_ords = parsed.dt.year * 10000 + parsed.dt.month * 100 + parsed.dt.day
+        for id_, text, h, rating, date, date_ord in zip(
+            ids, texts, hashes, ratings, chunk["Date"], date_ords
+        ):
+            metadata = {"date": str(date), "content_hash": h}
+            if pd.notna(rating):
+                metadata["rating"] = int(rating)
+            if pd.notna(date_ord):
+                metadata["date_ord"] = int(date_ord)
+            yield id_, text, metadata
+
+
+def stored_metadata(page_size=5000):
+    """Map of id -> metadata for everything currently in the collection."""
+    stored = {}
+    offset = 0
+    while True:
+        page = vector_store.get(include=["metadatas"], limit=page_size, offset=offset)
+        stored.update(zip(page["ids"], page["metadatas"]))
+        if len(page["ids"]) < page_size:
+            return stored
+        offset += page_size
+
+
+def _embed_and_upsert(pool, rows):
+    batches = [rows[i:i + embed_batch_size] for i in range(0, len(rows), embed_batch_size)]
+    vectors = pool.map(lambda batch: embeddings.embed_documents([text for _, text, _ in batch]), batches)
+    # embedding runs concurrently; writes stay on this thread
+    for batch, batch_vectors in zip(batches, vectors):
+        vector_store._collection.upsert(
+            ids=[id_ for id_, _, _ in batch],
+            embeddings=batch_vectors,
+            documents=[text for _, text, _ in batch],
+            metadatas=[meta for _, _, meta in batch],
+        )
+
+
+def sync_reviews(path=csv_path):
+    """Bring the vector store in line with the CSV.
+
+    Only new or changed reviews are embedded; metadata-only edits are updated
+    in place and rows missing from the CSV are deleted.
+    """
+    stored = stored_metadata()
+    seen = set()
+    pending, meta_updates = [], []
+    embedded = 0
+
+    with ThreadPoolExecutor(max_workers=embed_concurrency) as pool:
+        for id_, text, metadata in read_reviews(path):
+            if id_ in seen:
+                continue  # duplicate Id in the CSV
+            seen.add(id_)
+            old = stored.get(id_)
+            if old is None or old.get("content_hash") != metadata["content_hash"]:
+                pending.append((id_, text, metadata))
+            elif old != metadata:
+                # update() merges keys; None removes ones that are now blank (rating/date_ord)
+                cleared = {key: None for key in old if key not in metadata}
+                meta_updates.append((id_, {**cleared, **metadata}))
+            if len(pending) >= embed_batch_size * embed_concurrency:
+                _embed_and_upsert(pool, pending)
+                embedded += len(pending)
+                pending = []
+        if pending:
+            _embed_and_upsert(pool, pending)
+            embedded += len(pending)
+
+    # Chroma rejects writes larger than its max batch size
+    max_batch = vector_store._client.get_max_batch_size()
+    for i in range(0, len(meta_updates), max_batch):
+        batch = meta_updates[i:i + max_batch]
+        vector_store._collection.update(
+            ids=[id_ for id_, _ in batch],
+            metadatas=[meta for _, meta in batch],
+        )
+    removed = [id_ for id_ in stored if id_ not in seen]
+    for i in range(0, len(removed), max_batch):
+        vector_store.delete(ids=removed[i:i + max_batch])
+
+    print(f"[vector] embedded {embedded}, metadata updated {len(meta_updates)}, "
+          f"deleted {len(removed)}, unchanged {len(seen) - embedded - len(meta_updates)}")
+
+
+def reviews_fingerprint(ids):
+    """Hash of the given reviews' content plus the collection size.
+
+    Changes whenever one of the reviews is edited or removed, or reviews are
+    added (which can change what a search would return).
+    """
+    found = vector_store.get(ids=list(ids), include=["metadatas"])
+    pairs = sorted(zip(found["ids"], (m.get("content_hash") for m in found["metadatas"])))
+    payload = json.dumps([vector_store._collection.count(), pairs])
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
 
-if add_documents:
-    vector_store.add_documents(documents=documents, ids=ids)
 
-retriever = vector_store.as_retriever(
-    search_kwargs={"k": 5}
-)
\ No newline at end of file
+if os.path.exists(csv_path):
+    sync_reviews()